@@ -1,90 +1,517 @@
 import re
+import atexit
+import contextlib
+import cv2
 import easyocr
+import functools
+import hashlib
+import json
+import multiprocessing
 import os
-import pandas as pd
+import queue
+import threading
+import numpy as np
+import openpyxl
+import torch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font
 
 # ===== Load Settings =====
+DEFAULT_SETTINGS = {
+    'SOURCE_DIR': 'source_image',
+    'OUTPUT_EXCEL': 'result.xlsx',
+    'LANGUAGES': ['en', 'ar'],
+    'USE_GPU': torch.cuda.is_available(),
+    'MODEL_DIR': 'model_cache',
+    'OCR_WORKERS': 0,  # CPU-only worker processes; 0 = half the CPU cores
+    'USE_FP16': True,  # Run the GPU text recognizer in half precision
+    'QUANTIZE': True,  # Quantize the models to int8 when running on the CPU (EasyOCR's default)
+    'BATCH_SIZE': 16,  # Images per GPU batch
+    'BATCH_WIDTH': 800,  # Canvas batched images are letterboxed to
+    'BATCH_HEIGHT': 1440,
+    'CACHE_DIR': ''  # Folder to cache OCR results in so re-runs skip unchanged images; '' disables
+}
+
 try:
     import setting
-    SETTINGS = {
-        'SOURCE_DIR': getattr(setting, 'SOURCE_DIR', 'source_image'),
-        'OUTPUT_EXCEL': getattr(setting, 'OUTPUT_EXCEL', 'result.xlsx'),
-        'LANGUAGES': getattr(setting, 'LANGUAGES', ['en', 'ar']),
-        'USE_GPU': getattr(setting, 'USE_GPU', False)
-    }
 except ModuleNotFoundError:
-    SETTINGS = {
-        'SOURCE_DIR': 'source_image',
-        'OUTPUT_EXCEL': 'result.xlsx',
-        'LANGUAGES': ['en', 'ar'],
-        'USE_GPU': False
-    }
+    setting = None
+
+SETTINGS = {key: getattr(setting, key, default) for key, default in DEFAULT_SETTINGS.items()}
 
 # ===== Save current settings to setting.py =====
 def save_settings():
-    content = f"""# Auto-generated settings
-SOURCE_DIR = '{SETTINGS['SOURCE_DIR']}'
-OUTPUT_EXCEL = '{SETTINGS['OUTPUT_EXCEL']}'
-LANGUAGES = {SETTINGS['LANGUAGES']}
-USE_GPU = {SETTINGS['USE_GPU']}
-"""
+    lines = ['# Auto-generated settings']
+    lines += [f"{key} = {value!r}" for key, value in SETTINGS.items()]
+    content = '\n'.join(lines) + '\n'
+
+    # Skip the write when nothing changed
+    if os.path.exists('setting.py'):
+        with open('setting.py', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+
     with open('setting.py', 'w', encoding='utf-8') as f:
         f.write(content)
 
-save_settings()
+# ===== Batching =====
+MIN_BATCHED_IMAGES = 8  # Sequential OCR is faster for small image counts
+
+# ===== Image Discovery =====
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+
+def list_images(source_dir):
+    # scandir yields the file type with each entry, so no extra stat calls
+    with os.scandir(source_dir) as entries:
+        return [entry.name for entry in entries if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)]
+
+# ===== Image Prefetching =====
+PREFETCH_WORKERS = 4
+PREFETCH_DEPTH = 8
+
+def letterbox(image, width, height):
+    """Scale an image to fit width x height, keeping its aspect ratio, and pad the rest."""
+    h, w = image.shape[:2]
+    scale = min(width / w, height / h)
+    new_w, new_h = max(1, round(w * scale)), max(1, round(h * scale))
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    canvas = np.zeros((height, width) + image.shape[2:], dtype=np.uint8)
+    canvas[:new_h, :new_w] = cv2.resize(image, (new_w, new_h), interpolation=interpolation)
+    return canvas
+
+def load_image(image_path, size=None):
+    """Decode an image into the RGB and greyscale copies EasyOCR builds from a file path."""
+    # np.fromfile + imdecode also handles non-ASCII paths, unlike cv2.imread on Windows
+    data = np.fromfile(image_path, dtype=np.uint8)
+    image = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Cannot decode image '{image_path}'")
+    # The detector expects RGB, and the recognizer reads OpenCV's own greyscale
+    # decode, which differs slightly from converting the colour image
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    grey = cv2.imdecode(data, cv2.IMREAD_GRAYSCALE)
+    if size:
+        image, grey = letterbox(image, *size), letterbox(grey, *size)
+    return image, grey
+
+def prefetch_images(image_paths, depth=PREFETCH_DEPTH, size=None):
+    """Yield futures of decoded images, keeping up to `depth` reads ahead of the consumer."""
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as executor:
+        pending = deque()
+        for image_path in image_paths:
+            pending.append(executor.submit(load_image, image_path, size))
+            if len(pending) >= depth:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
 
 # ===== Phone Number Extraction =====
+PHONE_PATTERNS = tuple(re.compile(p) for p in (
+    r'\+\d{1,3}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}',
+    r'\b\d{1,3}[\s\-]?\d{2,4}[\s\-]?\d{3,4}[\s\-]?\d{3,4}\b',
+    r'\b[\(]?0\d{1,3}[\)]?[\s\-]?\d{3,4}[\s\-]?\d{3,4}\b',
+    r'\b\d{10,15}\b'
+))
+DIGIT_RE = re.compile(r'\d')
+# Deletion table for str.translate: every character `\s` matches (all at or
+# below U+3000) plus dashes and parentheses
+STRIP_TABLE = dict.fromkeys(
+    [c for c in range(0x3001) if chr(c).isspace()] + [ord(c) for c in '-()']
+)
+
+def _normalize_international(number):
+    if number.startswith('966') or len(number) >= 10:
+        return '+' + number
+    return number
+
+def _normalize_trunk(number):
+    # '00' is the international call prefix; other 10-digit 0-numbers are Saudi local
+    if number.startswith('00'):
+        return '+' + number[2:]
+    if len(number) == 10:
+        return '+966' + number[1:]
+    return _normalize_international(number)
+
+# Normalizers dispatched on the first character of a cleaned number
+NORMALIZERS = {
+    '+': lambda number: number,
+    '0': _normalize_trunk
+}
+
 def extract_phone_numbers_global(text):
     """Extract phone numbers from various countries and formats."""
-    phone_numbers = []
+    # Every pattern needs digits; skip the scans for digit-free text
+    if not DIGIT_RE.search(text):
+        return []
 
-    # Patterns
-    pattern1 = r'\+\d{1,3}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}'
-    pattern2 = r'\b\d{1,3}[\s\-]?\d{2,4}[\s\-]?\d{3,4}[\s\-]?\d{3,4}\b'
-    pattern3 = r'\b[\(]?0\d{1,3}[\)]?[\s\-]?\d{3,4}[\s\-]?\d{3,4}\b'
-    pattern4 = r'\b\d{10,15}\b'
+    phone_numbers = []
 
-    for pattern in [pattern1, pattern2, pattern3, pattern4]:
-        matches = re.findall(pattern, text)
-        phone_numbers.extend(matches)
+    for pattern in PHONE_PATTERNS:
+        phone_numbers.extend(pattern.findall(text))
 
     # Clean and normalize
     cleaned_numbers = []
     seen = set()
     for number in phone_numbers:
-        cleaned = re.sub(r'[\s\-\(\)]', '', number)
+        cleaned = number.translate(STRIP_TABLE)
         if len(cleaned) < 8 or len(cleaned) > 15:
             continue
-        if cleaned == '0' * len(cleaned):
+        if not cleaned.strip('0'):
             continue
-        # Normalize
-        if not cleaned.startswith('+'):
-            if cleaned.startswith('00'):
-                cleaned = '+' + cleaned[2:]
-            elif cleaned.startswith('0') and len(cleaned) == 10:
-                cleaned = '+966' + cleaned[1:]
-            elif cleaned.startswith('966'):
-                cleaned = '+' + cleaned
-            elif len(cleaned) >= 10:
-                cleaned = '+' + cleaned
+        cleaned = NORMALIZERS.get(cleaned[0], _normalize_international)(cleaned)
         if cleaned not in seen:
             seen.add(cleaned)
             cleaned_numbers.append(cleaned)
 
     return cleaned_numbers
 
+# ===== OCR Reader =====
+def get_reader(languages=None, gpu=None):
+    """Return a shared EasyOCR reader so model weights are loaded once per process."""
+    languages = tuple(languages or SETTINGS['LANGUAGES'])
+    if gpu is None:
+        gpu = SETTINGS['USE_GPU'] and torch.cuda.is_available()
+    gpu = bool(gpu)
+    # Every setting the reader is built from is part of the cache key, so
+    # changing one in-process loads a fresh reader instead of a stale one
+    return _load_reader(languages, gpu, SETTINGS['QUANTIZE'], gpu and SETTINGS['USE_FP16'], SETTINGS['MODEL_DIR'])
+
+@functools.lru_cache(maxsize=4)
+def _load_reader(languages, gpu, quantize, fp16, model_dir):
+    # EasyOCR only quantizes on the CPU, so QUANTIZE and USE_FP16 don't overlap
+    reader = easyocr.Reader(
+        list(languages),
+        gpu=gpu,
+        quantize=quantize,
+        cudnn_benchmark=True,
+        model_storage_directory=model_dir,
+        # EasyOCR 1.7.2 stores quantize as a one-element tuple, which is always
+        # truthy, so its detector would be quantized either way; load the
+        # detector below with the real flag instead
+        detector=False
+    )
+    reader.quantize = quantize
+    reader.setDetector('craft')
+    # Readers don't keep their language list; ocr_profile needs it for cache keys
+    reader.lang_list = list(languages)
+    if fp16:
+        _enable_fp16_recognizer(reader)
+    return reader
+
+def _enable_fp16_recognizer(reader):
+    """Run the recognizer forward pass under CUDA autocast (FP16).
+
+    The detector stays in FP32 because EasyOCR post-processes its score maps
+    with OpenCV, which does not accept float16 arrays.
+    """
+    forward = reader.recognizer.forward
+
+    def forward_fp16(*args, **kwargs):
+        with torch.autocast(device_type='cuda', dtype=torch.float16):
+            return forward(*args, **kwargs).float()
+
+    reader.recognizer.forward = forward_fp16
+    reader.fp16 = True
+
 # ===== Extract Info from Image =====
-def extract_info_from_image(image_path, reader):
-    result = reader.readtext(image_path)
-    all_text = ' '.join([det[1] for det in result])
+def extract_info_from_text(texts):
+    all_text = ' '.join(texts)
     phone_numbers = extract_phone_numbers_global(all_text)
     return {
         'phone_numbers': phone_numbers,
         'all_text': all_text
     }
 
+def extract_info_from_image(image_path, reader):
+    return extract_info_from_text(reader.readtext(image_path, detail=0))
+
+# ===== OCR Runners =====
+def read_decoded(reader, images, greys, batch_size=1):
+    """readtext(detail=0) over images already decoded by load_image.
+
+    reader.readtext would treat an array as BGR and derive its own greyscale
+    copy, so the detect and recognize steps are called directly instead.
+    """
+    horizontal_lists, free_lists = reader.detect(images, reformat=False)
+    return [
+        reader.recognize(grey, horizontal_list, free_list, batch_size=batch_size, detail=0, reformat=False)
+        for grey, horizontal_list, free_list in zip(greys, horizontal_lists, free_lists)
+    ]
+
+# Each runner yields (image_file, texts) pairs; texts is the exception
+# raised for that image when OCR fails, so one bad file doesn't stop the run.
+def ocr_sequential(image_files, source_dir, reader, size=None):
+    paths = [os.path.join(source_dir, image_file) for image_file in image_files]
+    for image_file, loaded in zip(image_files, prefetch_images(paths, size=size)):
+        try:
+            image, grey = loaded.result()
+            yield image_file, read_decoded(reader, image, [grey])[0]
+        except Exception as e:
+            yield image_file, e
+
+def ocr_batched(image_files, source_dir, reader):
+    """Run OCR over fixed-size batches so the detector sees real tensor batches."""
+    batch_size = SETTINGS['BATCH_SIZE']
+    width, height = SETTINGS['BATCH_WIDTH'], SETTINGS['BATCH_HEIGHT']
+
+    # Batched EasyOCR needs a warmup pass before it outpaces sequential calls
+    reader.readtext_batched(np.zeros((batch_size, height, width, 3), dtype=np.uint8), batch_size=batch_size)
+
+    paths = [os.path.join(source_dir, image_file) for image_file in image_files]
+    # Letterboxing to one canvas size in the loader threads gives readtext_batched
+    # uniform inputs without distorting the screenshots
+    loaded = zip(image_files, prefetch_images(paths, depth=2 * batch_size, size=(width, height)))
+    while chunk := list(islice(loaded, batch_size)):
+        names = [image_file for image_file, _ in chunk]
+        try:
+            images, greys = zip(*(loaded.result() for _, loaded in chunk))
+            results = read_decoded(reader, np.array(images), greys, batch_size)
+        except Exception:
+            # Retry one by one so only the offending image is reported, on the
+            # same canvas so the results match the batched cache profile
+            yield from ocr_sequential(names, source_dir, reader, (width, height))
+            continue
+        yield from zip(names, results)
+
+# ===== CPU Worker Processes =====
+# PyTorch is not thread-safe, so CPU-only hosts scale OCR across processes,
+# each holding its own reader.
+_worker_error = None
+
+def _init_worker(threads, reader_settings):
+    global _worker_error
+    # Spawned workers re-read setting.py; use the parent's values instead
+    SETTINGS.update(reader_settings)
+    # Split the cores between workers instead of letting each one claim them all
+    torch.set_num_threads(threads)
+    try:
+        get_reader(gpu=False)
+    except Exception as e:
+        # An initializer that raises makes Pool respawn the worker forever;
+        # keep the error and report it from the first task instead
+        _worker_error = e
+
+def _process_one(image_path):
+    if _worker_error is not None:
+        raise _worker_error
+    try:
+        return get_reader(gpu=False).readtext(image_path, detail=0)
+    except Exception as e:
+        return e
+
+_pool = None
+_pool_workers = 0
+_pool_settings = None
+
+def get_pool(workers):
+    """Return the shared worker pool, so readers are loaded once per worker, not per run."""
+    global _pool, _pool_workers, _pool_settings
+    # Workers keep the reader they were started with, so settings that change
+    # the reader force a new pool just like a larger worker count does
+    reader_settings = {
+        'LANGUAGES': list(SETTINGS['LANGUAGES']),
+        'QUANTIZE': SETTINGS['QUANTIZE'],
+        'MODEL_DIR': SETTINGS['MODEL_DIR']
+    }
+    if _pool is None or _pool_workers < workers or _pool_settings != reader_settings:
+        _shutdown_pool()
+        print(f"Initializing EasyOCR in {workers} worker processes (this may take a moment)...")
+        # Load the reader once here so the model weights are downloaded a single
+        # time; concurrent workers would clobber each other's temp download
+        get_reader(gpu=False)
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        _pool = multiprocessing.Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(threads, reader_settings)
+        )
+        _pool_workers = workers
+        _pool_settings = reader_settings
+    return _pool
+
+@atexit.register
+def _shutdown_pool():
+    # Workers don't shut down on their own when the interpreter exits
+    global _pool
+    if _pool is not None:
+        _pool.terminate()
+        _pool = None
+
+def ocr_multiprocess(image_files, source_dir, workers):
+    # Not a generator: the pool must be created (and fork) on the calling
+    # thread, before run_in_background starts any other threads
+    paths = [os.path.join(source_dir, image_file) for image_file in image_files]
+    pool = get_pool(workers)
+    return _collect_pool_results(pool, image_files, pool.imap(_process_one, paths, chunksize=4))
+
+def _collect_pool_results(pool, image_files, results):
+    global _pool
+    finished = False
+    try:
+        yield from zip(image_files, results)
+        finished = True
+    finally:
+        # Tasks already handed to imap would keep the shared pool busy with an
+        # abandoned run, so the next run would wait behind them. Only this
+        # run's pool is stopped; a newer run may already have replaced it.
+        if not finished:
+            pool.terminate()
+            if _pool is pool:
+                _pool = None
+
+# ===== OCR Result Cache =====
+# Texts are cached per image, keyed on its path, size and mtime plus the OCR
+# profile, so re-runs only OCR new or modified files.
+def ocr_profile(reader, use_gpu, batched):
+    """Describe everything that shapes the OCR output, for use in cache keys."""
+    if reader is None:
+        languages, device = SETTINGS['LANGUAGES'], 'cuda' if use_gpu else 'cpu'
+        quantize, fp16 = SETTINGS['QUANTIZE'], use_gpu and SETTINGS['USE_FP16']
+    else:
+        device = reader.device
+        # _load_reader stores the languages and flags it built the reader with
+        languages = getattr(reader, 'lang_list', None)
+        if languages is None:
+            # Readers made elsewhere only keep the recognizer model and the
+            # characters their languages allow
+            charset = hashlib.sha1(''.join(reader.lang_char).encode('utf-8')).hexdigest()[:12]
+            languages = [reader.model_lang, charset]
+        quantize, fp16 = getattr(reader, 'quantize', True), getattr(reader, 'fp16', False)
+        if isinstance(quantize, tuple):
+            # A reader not made by get_reader keeps EasyOCR's one-element tuple,
+            # and its detector is quantized even when the recognizer is not
+            quantize = quantize[0] or 'recognizer-only'
+
+    parts = [','.join(languages), device]
+    # EasyOCR only quantizes on the CPU and FP16 only applies on the GPU
+    parts.append(f"quantize={quantize}" if device == 'cpu' else f"fp16={fp16}")
+    if batched:
+        parts.append(f"letterbox={SETTINGS['BATCH_WIDTH']}x{SETTINGS['BATCH_HEIGHT']}")
+    return '|'.join(parts)
+
+def _cache_path(image_path, profile):
+    stat = os.stat(image_path)
+    key = f"{os.path.abspath(image_path)}|{stat.st_size}|{stat.st_mtime_ns}|{profile}"
+    return os.path.join(SETTINGS['CACHE_DIR'], hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+def load_cached_texts(image_files, source_dir, profile):
+    """Return {image_file: texts} for the images that already have cached OCR results."""
+    cached = {}
+    if not SETTINGS['CACHE_DIR']:
+        return cached
+    for image_file in image_files:
+        try:
+            with open(_cache_path(os.path.join(source_dir, image_file), profile), encoding='utf-8') as f:
+                cached[image_file] = json.load(f)
+        except (OSError, ValueError):
+            continue
+    return cached
+
+def save_cached_texts(image_path, profile, texts):
+    if not SETTINGS['CACHE_DIR']:
+        return
+    os.makedirs(SETTINGS['CACHE_DIR'], exist_ok=True)
+    cache_path = _cache_path(image_path, profile)
+    # Write then rename so an interrupted run never leaves a truncated entry
+    with open(cache_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(texts, f, ensure_ascii=False)
+    os.replace(cache_path + '.tmp', cache_path)
+
+def with_cache(image_files, source_dir, profile, cached, results):
+    """Merge cached texts with fresh OCR results in image order, caching the fresh ones.
+
+    `results` must yield the uncached images in the same order as `image_files`.
+    """
+    try:
+        for image_file in image_files:
+            if image_file in cached:
+                yield image_file, cached[image_file]
+                continue
+            image_file, texts = next(results)
+            if not isinstance(texts, Exception):
+                try:
+                    save_cached_texts(os.path.join(source_dir, image_file), profile, texts)
+                except OSError as e:
+                    print(f" ! Could not cache OCR results for {image_file}: {e}")
+            yield image_file, texts
+    finally:
+        # Stopping early must reach the runner so it can cancel outstanding work
+        close = getattr(results, 'close', None)
+        if close is not None:
+            close()
+
+# ===== Pipeline =====
+PIPELINE_DEPTH = 32
+_DONE = object()
+
+def run_in_background(results, depth=PIPELINE_DEPTH):
+    """Drain an OCR runner on its own thread and yield its results through a bounded queue.
+
+    With image loading already on the prefetch threads, this lets text parsing
+    and Excel writes in the caller overlap with the next OCR call.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    errors = []
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in results:
+                if stop.is_set():
+                    break
+                buffer.put(item)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            close = getattr(results, 'close', None)
+            if close is not None:
+                close()
+            buffer.put(_DONE)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    finished = False
+    try:
+        while (item := buffer.get()) is not _DONE:
+            yield item
+        finished = True
+    finally:
+        # If the caller stops early (error, KeyboardInterrupt), tell the producer
+        # to quit and keep draining so it is never stuck on put(). Waiting for it
+        # to sign off means its cleanup has run by the time close() returns.
+        if not finished:
+            stop.set()
+            while buffer.get() is not _DONE:
+                pass
+        thread.join()
+    if errors:
+        raise errors[0]
+
+# ===== Excel Output =====
+HEADER_FONT = Font(bold=True)
+HEADER_ALIGNMENT = Alignment(horizontal='center')
+
+def create_sheet(workbook, title, *columns):
+    sheet = workbook.create_sheet(title)
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(sheet, value=column)
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        header.append(cell)
+    sheet.append(header)
+    return sheet
+
 # ===== Main Processing =====
-def process_all_images():
+def process_all_images(reader=None):
+    """OCR every image in SOURCE_DIR and write the results to OUTPUT_EXCEL.
+
+    Pass an existing EasyOCR reader (e.g. from a notebook) to reuse its loaded
+    models; otherwise one is created, or CPU worker processes are started.
+    """
     source_dir = SETTINGS['SOURCE_DIR']
     output_excel = SETTINGS['OUTPUT_EXCEL']
 
@@ -92,56 +519,82 @@ def process_all_images():
         print(f"Error: Directory '{source_dir}' not found!")
         return
 
-    image_extensions = ['.png', '.jpg', '.jpeg', '.bmp', '.tiff']
-    image_files = [f for f in os.listdir(source_dir) if os.path.splitext(f.lower())[1] in image_extensions]
+    image_files = list_images(source_dir)
 
     if not image_files:
         print(f"No images found in '{source_dir}' directory!")
         return
 
     print(f"Found {len(image_files)} images to process")
-    print("Initializing EasyOCR (this may take a moment)...")
-    reader = easyocr.Reader(SETTINGS['LANGUAGES'], gpu=SETTINGS['USE_GPU'])
+    use_gpu = SETTINGS['USE_GPU'] and torch.cuda.is_available()
+    on_gpu = reader.device != 'cpu' if reader is not None else use_gpu
+    # Decided from the whole directory, not just the uncached images, so the
+    # same images are always OCR'd at the same resolution
+    batched = on_gpu and len(image_files) >= MIN_BATCHED_IMAGES
+    profile = ocr_profile(reader, use_gpu, batched)
 
-    phone_data, all_text_data = [], []
+    cached = load_cached_texts(image_files, source_dir, profile)
+    pending = [image_file for image_file in image_files if image_file not in cached]
+    if cached:
+        print(f"Reusing cached OCR results for {len(cached)} images")
+
+    workers = min(SETTINGS['OCR_WORKERS'] or max(1, (os.cpu_count() or 1) // 2), len(pending))
+
+    if not pending:
+        results = iter(())
+    elif reader is None and not use_gpu and workers > 1:
+        results = ocr_multiprocess(pending, source_dir, workers)
+    else:
+        if reader is None:
+            print("Initializing EasyOCR (this may take a moment)...")
+            reader = get_reader(gpu=use_gpu)
+        if batched:
+            results = ocr_batched(pending, source_dir, reader)
+        else:
+            results = ocr_sequential(pending, source_dir, reader)
+    results = with_cache(image_files, source_dir, profile, cached, results)
+    results = run_in_background(results)
+
+    # Rows are streamed straight into a write-only workbook so memory stays
+    # flat no matter how many images (and how much text) are processed
+    workbook = openpyxl.Workbook(write_only=True)
+    phone_sheet = create_sheet(workbook, 'Phone Numbers', 'Image_Name', 'Phone_Number')
+    unique_sheet = create_sheet(workbook, 'Unique Numbers', 'Unique_Phone_Numbers')
+    text_sheet = create_sheet(workbook, 'All Text', 'Image_Name', 'All_Extracted_Text')
+
+    total_numbers = 0
+    unique_phones = {}
 
     print("\nProcessing images...")
     print("-" * 70)
 
-    for idx, image_file in enumerate(image_files, 1):
-        image_path = os.path.join(source_dir, image_file)
-        print(f"{idx}/{len(image_files)} Processing: {image_file}")
+    # Close the pipeline explicitly if this loop fails, so the background OCR
+    # stops now instead of whenever the generator is garbage collected
+    with contextlib.closing(results):
+        for idx, (image_file, texts) in enumerate(results, 1):
+            print(f"{idx}/{len(image_files)} Processing: {image_file}")
 
-        try:
-            info = extract_info_from_image(image_path, reader)
+            if isinstance(texts, Exception):
+                print(f" ✗ Error: {texts}")
+                continue
+
+            info = extract_info_from_text(texts)
 
             # Phone sheet
             for phone in info['phone_numbers']:
-                phone_data.append({
-                    'Image_Name': image_file,
-                    'Phone_Number': phone
-                })
+                phone_sheet.append([image_file, phone])
+            total_numbers += len(info['phone_numbers'])
+            unique_phones.update(dict.fromkeys(info['phone_numbers']))
 
             # All text
-            all_text_data.append({
-                'Image_Name': image_file,
-                'All_Extracted_Text': info['all_text']
-            })
-
-        except Exception as e:
-            print(f" ✗ Error: {e}")
+            text_sheet.append([image_file, info['all_text']])
 
     # Save results to Excel
-    with pd.ExcelWriter(output_excel, engine='openpyxl') as writer:
-        if phone_data:
-            pd.DataFrame(phone_data).to_excel(writer, sheet_name='Phone Numbers', index=False)
-            unique_phones = list(set(d['Phone_Number'] for d in phone_data))
-            pd.DataFrame({'Unique_Phone_Numbers': sorted(unique_phones)}).to_excel(writer, sheet_name='Unique Numbers', index=False)
-
-        pd.DataFrame(all_text_data).to_excel(writer, sheet_name='All Text', index=False)
+    for phone in sorted(unique_phones):
+        unique_sheet.append([phone])
+    workbook.save(output_excel)
 
-    total_numbers = len(phone_data) if phone_data else 0
-    unique_count = len(set(d['Phone_Number'] for d in phone_data)) if phone_data else 0
+    unique_count = len(unique_phones)
 
     print(f"\n✓ Processing complete!")
     print(f" Total images processed: {len(image_files)}")
@@ -154,4 +607,5 @@ def process_all_images():
     print(f" 3. All Text - Complete extracted text from each image")
 
 if __name__ == "__main__":
+    save_settings()
     process_all_images()
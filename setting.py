@@ -2,4 +2,12 @@
 SOURCE_DIR = 'source_image'
 OUTPUT_EXCEL = 'result.xlsx'
 LANGUAGES = ['en', 'ar']
-USE_GPU = False
+USE_GPU = True
+MODEL_DIR = 'model_cache'
+OCR_WORKERS = 0
+USE_FP16 = True
+QUANTIZE = True
+BATCH_SIZE = 16
+BATCH_WIDTH = 800
+BATCH_HEIGHT = 1440
+CACHE_DIR = ''